@@ -0,0 +1,53 @@
+# cython: language_level=3
+"""
+Ahead-of-time compiled kernels for the finite difference
+solvers in m.py, used in place of the numba ones when this
+extension has been built (python setup.py build_ext --inplace).
+"""
+cimport cython
+from cython cimport floating
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def explicit_traverse(floating[::1, :] grid, floating[:, ::1] abc,
+                      Py_ssize_t M, Py_ssize_t N):
+    """ Explicit scheme kernel: fill the grid backwards in time """
+    cdef Py_ssize_t i, j
+    cdef floating gim1, gi, gip1
+
+    for j in range(N-1, -1, -1):
+        gim1 = grid[0, j+1]
+        gi = grid[1, j+1]
+        for i in range(1, M):
+            gip1 = grid[i+1, j+1]
+            grid[i, j] = abc[i, 0]*gim1 + abc[i, 1]*gi + abc[i, 2]*gip1
+            gim1 = gi
+            gi = gip1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def psor_sweep(double[::1] rhs, double[::1] old_values,
+               double[::1] new_values, double[::1] payoffs,
+               double[::1] alpha, double[::1] one_minus_beta,
+               double[::1] gamma, double[::1] psor_scale):
+    """
+    One projected SOR sweep in increasing k, returns the squared
+    change. Same ordering as the numba _psor_sweep.
+    """
+    cdef Py_ssize_t k, n = new_values.shape[0]
+    cdef double residual, payoff, diff, left = 0.0, err2 = 0.0
+
+    for k in range(n):
+        residual = rhs[k] - one_minus_beta[k]*old_values[k] + \
+                   alpha[k]*left
+        if k < n-1:
+            residual += gamma[k]*old_values[k+1]
+        payoff = old_values[k] + psor_scale[k]*residual
+        left = payoff if payoff > payoffs[k] else payoffs[k]
+        new_values[k] = left
+        diff = left - old_values[k]
+        err2 += diff*diff
+    return err2
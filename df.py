@@ -15,20 +15,13 @@ class FiniteDifferences(object):
         self.Smax = Smax
         self.M, self.N = M, N
         self.is_call = not is_put
+        self.dS = Smax/float(M)
+        self.dt = T/float(N)
 
         self.i_values = np.arange(self.M)
         self.j_values = np.arange(self.N)
         self.grid = np.zeros(shape=(self.M+1, self.N+1))
         self.boundary_conds = np.linspace(0, Smax, self.M+1)
-        @property
-        def dS(self):
-            return self.Smax/float(self.M)
-        @property
-        def dt(self):
-            return self.T/float(self.N)
-        @property
-        def dt(self):
-             return self.T/float(self.N)
         @abstractmethod
         def setup_boundary_conditions(self):
             raise NotImplementedError('Implementation required!')
@@ -68,7 +61,7 @@ class FiniteDifferences(object):
                               self.r*self.i_values)
                 def traverse_grid(self):
                     for j in reversed(self.j_values):
-                        for i in range(self.M)[2:]:
+                        for i in range(1, self.M):
                             self.grid[i,j] = \
                                 self.a[i]*self.grid[i-1,j+1] +\
                                 self.b[i]*self.grid[i,j+1] + \
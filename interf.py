@@ -15,9 +15,9 @@ is_put = st.sidebar.checkbox("Is it a Put Option?", value=True)
 Sbarrier = st.sidebar.number_input("Barrier Price (Sbarrier)", value=40.0)
 
 method = st.radio("Select Pricing Method", ["Méthode explicite européen", "Méthodeimplicite européen",'Methode Crank-Nicolson européen','Methode Crank-Nicolson option exotique','Methode Crank-Nicolson américain'])
-def calculate_option_price():
-    option_price = None
-    
+@st.cache_data(show_spinner=False)
+def _price(method, S0, K, r, T, sigma, Smax, M, N, is_put, Sbarrier):
+    # Memoized on the inputs, so reruns with unchanged values are instant
     if method == "Méthode explicite européen":
         option = tc.FDExplicitEu(S0, K, r, T, sigma, Smax, M, N, is_put)
     elif method == "Méthode implicite européen":
@@ -30,7 +30,11 @@ def calculate_option_price():
         option = tc.FDCnAm( S0, K, r, T, sigma, 
             Smax, M, N, omega=1, tol=0, is_put=False)
 
-    option_price = option.price()
+    return option.price()
+
+def calculate_option_price():
+    option_price = _price(method, S0, K, r, T, sigma, Smax, M, N,
+                          is_put, Sbarrier)
     st.write(f'Option Price: {option_price:.4f}')
 
 # Assuming you have variables like S0, K, r, T, sigma, Smax, M, N, is_put, and method defined
@@ -9,7 +9,8 @@ class FiniteDifferences(object):
 
     def __init__(
         self, S0, K, r=0.05, T=1, 
-        sigma=0, Smax=1, M=1, N=1, is_put=False
+        sigma=0, Smax=1, M=1, N=1, is_put=False,
+        dtype=np.float64
     ):
         self.S0 = S0
         self.K = K
@@ -19,19 +20,26 @@ class FiniteDifferences(object):
         self.Smax = Smax
         self.M, self.N = M, N
         self.is_call = not is_put
+        self.dS = Smax/float(M)
+        self.dt = T/float(N)
+        # Grid precision, float32 is opt-in and its roundoff grows with N
+        self.dtype = dtype
 
         self.i_values = np.arange(self.M)
         self.j_values = np.arange(self.N)
-        self.grid = np.zeros(shape=(self.M+1, self.N+1))
+        # Column-major, so each time column grid[:, j] is contiguous
+        self.grid = np.zeros(
+            shape=(self.M+1, self.N+1), dtype=self.dtype, order='F')
         self.boundary_conds = np.linspace(0, Smax, self.M+1)
 
-    @property
-    def dS(self):
-        return self.Smax/float(self.M)
-
-    @property
-    def dt(self):
-        return self.T/float(self.N)
+    def discount_factors(self):
+        """
+        exp(-r*dt*(N-j)) for each j in j_values, using a single
+        exp and a cumulative product instead of one exp per column.
+        """
+        factors = np.cumprod(np.r_[
+            1.0, np.full(self.N, np.exp(-self.r*self.dt))])
+        return factors[::-1][:len(self.j_values)]
 
     @abstractmethod
     def setup_boundary_conditions(self):
@@ -65,6 +73,36 @@ class FiniteDifferences(object):
     
 import numpy as np
 
+# numba kernels are preferred, then the Cython extension when it has
+# been built, then NumPy
+try:
+    from _fd_kernels import explicit_traverse as _cy_explicit_traverse
+    from _fd_kernels import psor_sweep as _cy_psor_sweep
+    HAS_CYTHON = True
+except ImportError:
+    HAS_CYTHON = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """ Stand-in decorator when numba is not installed """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _explicit_traverse(grid, abc, M, N):
+    """ Explicit scheme kernel: fill the grid backwards in time """
+    for j in range(N-1, -1, -1):
+        for i in range(1, M):
+            grid[i,j] = abc[i,0]*grid[i-1,j+1] + \
+                        abc[i,1]*grid[i,j+1] + \
+                        abc[i,2]*grid[i+1,j+1]
+
 """ 
 Explicit method of Finite Differences 
 """
@@ -75,98 +113,171 @@ class FDExplicitEu(FiniteDifferences):
             self.grid[:,-1] = np.maximum(
                 0, self.boundary_conds - self.K)
             self.grid[-1,:-1] = (self.Smax-self.K) * \
-                np.exp(-self.r*self.dt*(self.N-self.j_values))
+                self.discount_factors()
         else:
             self.grid[:,-1] = np.maximum(
                 0, self.K-self.boundary_conds)
             self.grid[0,:-1] = (self.K-self.Smax) * \
-                np.exp(-self.r*self.dt*(self.N-self.j_values))
+                self.discount_factors()
 
     def setup_coefficients(self):
-        self.a = 0.5*self.dt*((self.sigma**2) *
-                              (self.i_values**2) -
-                              self.r*self.i_values)
-        self.b = 1 - self.dt*((self.sigma**2) *
-                              (self.i_values**2) +
-                              self.r)
-        self.c = 0.5*self.dt*((self.sigma**2) *
-                              (self.i_values**2) +
-                              self.r*self.i_values)
+        a = 0.5*self.dt*((self.sigma**2) *
+                         (self.i_values**2) -
+                         self.r*self.i_values)
+        b = 1 - self.dt*((self.sigma**2) *
+                         (self.i_values**2) +
+                         self.r)
+        c = 0.5*self.dt*((self.sigma**2) *
+                         (self.i_values**2) +
+                         self.r*self.i_values)
+        # One row of (a, b, c) per node, read together by the stencil
+        self.abc = np.ascontiguousarray(
+            np.stack([a, b, c], axis=1), dtype=self.dtype)
 
     def traverse_grid(self):
-        for j in reversed(self.j_values):
-            for i in range(self.M)[2:]:
-                self.grid[i,j] = \
-                    self.a[i]*self.grid[i-1,j+1] +\
-                    self.b[i]*self.grid[i,j+1] + \
-                    self.c[i]*self.grid[i+1,j+1]
-
-
+        if HAS_NUMBA:
+            _explicit_traverse(self.grid, self.abc, self.M, self.N)
+            return
+        if HAS_CYTHON:
+            _cy_explicit_traverse(self.grid, self.abc, self.M, self.N)
+            return
+
+        # Values at j+1 are all known, so sweep every i at once
+        M = self.M
+        a, b, c = self.abc[1:M, 0], self.abc[1:M, 1], self.abc[1:M, 2]
+        for j in range(self.N-1, -1, -1):
+            self.grid[1:M, j] = \
+                a*self.grid[0:M-1, j+1] + \
+                b*self.grid[1:M, j+1] + \
+                c*self.grid[2:M+1, j+1]
+
+
+import functools
 import numpy as np
 import scipy.linalg as linalg
 
+def _implicit_coefficients(sigma, r, dt, i_values):
+    a = 0.5*(r*dt*i_values -
+             (sigma**2)*dt*(i_values**2))
+    b = 1 + (sigma**2)*dt*(i_values**2) + r*dt
+    c = -0.5*(r*dt*i_values +
+              (sigma**2)*dt*(i_values**2))
+    return a, b, c
+
+def _tri_factor(sub, diag, sup):
+    """ LU-factorize a tridiagonal matrix for repeated solves """
+    *lu_piv, info = linalg.lapack.dgttrf(sub, diag, sup)
+    if info > 0:
+        raise linalg.LinAlgError('Singular tridiagonal matrix')
+    return tuple(lu_piv)
+
+def _tri_solve(lu_piv, rhs):
+    """ Solve with a factorization from _tri_factor """
+    x, info = linalg.lapack.dgttrs(*lu_piv, rhs)
+    return x
+
+@functools.lru_cache(maxsize=32)
+def _get_lu(sigma, r, T, N, M, i_start, scheme):
+    """
+    Factorized left-hand side of the 'implicit' or 'cn' scheme.
+    It only depends on these arguments and not on S0 or K, so
+    solvers sharing them reuse one factorization.
+    """
+    i_values = i_start + np.arange(M)
+    dt = T/float(N)
+    if scheme == 'implicit':
+        a, b, c = _implicit_coefficients(sigma, r, dt, i_values)
+        diagonals = (a[2:M], b[1:M], c[1:M-1])
+    else:
+        alpha, beta, gamma = _cn_coefficients(sigma, r, dt, i_values)
+        diagonals = (-alpha[2:M], 1-beta[1:M], -gamma[1:M-1])
+
+    lu_piv = _tri_factor(*diagonals)
+    for array in lu_piv:
+        # Shared between solvers, must not be modified
+        array.setflags(write=False)
+    return lu_piv
+
 """ 
 Explicit method of Finite Differences 
 """
 class FDImplicitEu(FDExplicitEu):
 
     def setup_coefficients(self):
-        self.a = 0.5*(self.r*self.dt*self.i_values -
-                      (self.sigma**2)*self.dt*\
-                          (self.i_values**2))
-        self.b = 1 + \
-                 (self.sigma**2)*self.dt*\
-                    (self.i_values**2) + self.r*self.dt
-        self.c = -0.5*(self.r*self.dt*self.i_values +
-                       (self.sigma**2)*self.dt*\
-                           (self.i_values**2))
-        self.coeffs = np.diag(self.a[2:self.M],-1) + \
-                      np.diag(self.b[1:self.M]) + \
-                      np.diag(self.c[1:self.M-1],1)
+        self.a, self.b, self.c = _implicit_coefficients(
+            self.sigma, self.r, self.dt, self.i_values)
+        self.lu_piv = _get_lu(
+            self.sigma, self.r, self.T, self.N, self.M,
+            float(self.i_values[0]), 'implicit')
 
     def traverse_grid(self):
         """ Solve using linear systems of equations """
-        P, L, U = linalg.lu(self.coeffs)
         aux = np.zeros(self.M-1)
 
         for j in reversed(range(self.N)):
             aux[0] = np.dot(-self.a[1], self.grid[0, j])
-            x1 = linalg.solve(L, self.grid[1:self.M, j+1]+aux)
-            x2 = linalg.solve(U, x1)
-            self.grid[1:self.M, j] = x2
+            self.grid[1:self.M, j] = _tri_solve(
+                self.lu_piv, self.grid[1:self.M, j+1]+aux)
             
 import scipy.linalg as linalg
 
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _tri_matvec_kernel(sub, diag, sup, x, out):
+    n = len(x)
+    for i in range(n):
+        value = diag[i]*x[i]
+        if i > 0:
+            value += sub[i-1]*x[i-1]
+        if i < n-1:
+            value += sup[i]*x[i+1]
+        out[i] = value
+    return out
+
+def _tri_matvec(sub, diag, sup, x, out):
+    """
+    Multiply a tridiagonal matrix, given by its diagonals,
+    by x into out in a single pass.
+    """
+    if HAS_NUMBA:
+        return _tri_matvec_kernel(sub, diag, sup, x, out)
+
+    np.multiply(diag, x, out=out)
+    out[1:] += sub*x[:-1]
+    out[:-1] += sup*x[1:]
+    return out
+
+def _cn_coefficients(sigma, r, dt, i_values):
+    alpha = 0.25*dt*(
+        (sigma**2)*(i_values**2) - r*i_values)
+    beta = -dt*0.5*(
+        (sigma**2)*(i_values**2) + r)
+    gamma = 0.25*dt*(
+        (sigma**2)*(i_values**2) + r*i_values)
+    return alpha, beta, gamma
+
 """ 
 Crank-Nicolson method of Finite Differences 
 """
 class FDCnEu(FDExplicitEu):
 
     def setup_coefficients(self):
-        self.alpha = 0.25*self.dt*(
-            (self.sigma**2)*(self.i_values**2) - \
-            self.r*self.i_values)
-        self.beta = -self.dt*0.5*(
-            (self.sigma**2)*(self.i_values**2) + self.r)
-        self.gamma = 0.25*self.dt*(
-            (self.sigma**2)*(self.i_values**2) +
-            self.r*self.i_values)
-        self.M1 = -np.diag(self.alpha[2:self.M], -1) + \
-                  np.diag(1-self.beta[1:self.M]) - \
-                  np.diag(self.gamma[1:self.M-1], 1)
-        self.M2 = np.diag(self.alpha[2:self.M], -1) + \
-                  np.diag(1+self.beta[1:self.M]) + \
-                  np.diag(self.gamma[1:self.M-1], 1)
+        self.alpha, self.beta, self.gamma = _cn_coefficients(
+            self.sigma, self.r, self.dt, self.i_values)
+        # M1 is only needed factorized, M2 as (sub, diag, super)
+        self.lu_piv = _get_lu(
+            self.sigma, self.r, self.T, self.N, self.M,
+            float(self.i_values[0]), 'cn')
+        self.M2 = (self.alpha[2:self.M],
+                   1+self.beta[1:self.M],
+                   self.gamma[1:self.M-1])
 
     def traverse_grid(self):
         """ Solve using linear systems of equations """
-        P, L, U = linalg.lu(self.M1)
+        rhs = np.empty(self.M-1)
 
         for j in reversed(range(self.N)):
-            x1 = linalg.solve(
-                L, np.dot(self.M2, self.grid[1:self.M, j+1]))
-            x2 = linalg.solve(U, x1)
-            self.grid[1:self.M, j] = x2
+            _tri_matvec(*self.M2, self.grid[1:self.M, j+1], rhs)
+            self.grid[1:self.M, j] = _tri_solve(self.lu_piv, rhs)
             
 import numpy as np
 
@@ -178,24 +289,47 @@ class FDCnDo(FDCnEu):
 
     def __init__(
         self, S0, K, r=0.05, T=1, sigma=0, 
-        Sbarrier=0, Smax=1, M=1, N=1, is_put=False
+        Sbarrier=0, Smax=1, M=1, N=1, is_put=False,
+        dtype=np.float64
     ):
         super(FDCnDo, self).__init__(
             S0, K, r=r, T=T, sigma=sigma,
-            Smax=Smax, M=M, N=N, is_put=is_put
+            Smax=Smax, M=M, N=N, is_put=is_put, dtype=dtype
         )
         self.barrier = Sbarrier
+        self.dS = (Smax-Sbarrier)/float(M)
         self.boundary_conds = \
             np.linspace(Sbarrier, Smax, M+1)
-        self.i_values = self.boundary_conds/self.dS
-
-    @property
-    def dS(self):
-        return (self.Smax-self.barrier)/float(self.M)
+        # Same as boundary_conds/dS, with an exact integer step
+        self.i_values = Sbarrier/self.dS + np.arange(M+1)
     
 import numpy as np
 import sys
 
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _psor_sweep(rhs, old_values, new_values, payoffs,
+                alpha, one_minus_beta, gamma, psor_scale):
+    """
+    One projected SOR sweep in increasing k, returns the squared
+    change. Coefficients are indexed by node, i.e. already sliced
+    [1:M]. The updated left neighbour is carried in a local rather
+    than read back from new_values, which keeps the loop-carried
+    dependency in registers.
+    """
+    n = len(new_values)
+    err2 = 0.0
+    left = 0.0
+    for k in range(n):
+        residual = rhs[k] - one_minus_beta[k]*old_values[k] + \
+                   alpha[k]*left
+        if k < n-1:
+            residual += gamma[k]*old_values[k+1]
+        payoff = old_values[k] + psor_scale[k]*residual
+        left = max(payoffs[k], payoff)
+        new_values[k] = left
+        err2 += (left-old_values[k])**2
+    return err2
+
 """ 
 Price an American option by the Crank-Nicolson method 
 """
@@ -219,70 +353,45 @@ class FDCnAm(FDCnEu):
                 self.K-self.boundary_conds[1:self.M])
 
         self.past_values = self.payoffs
-        self.boundary_values = self.K * np.exp(
-                -self.r*self.dt*(self.N-self.j_values))
-        
-    def calculate_payoff_start_boundary(self, rhs, old_values):
-        payoff = old_values[0] + \
-            self.omega/(1-self.beta[1]) * \
-                (rhs[0] - \
-                 (1-self.beta[1])*old_values[0] + \
-                 self.gamma[1]*old_values[1])
-
-        return max(self.payoffs[0], payoff)      
-    
-    def calculate_payoff_end_boundary(self, rhs, old_values, new_values):
-        payoff = old_values[-1] + \
-            self.omega/(1-self.beta[-2]) * \
-                (rhs[-1] + \
-                 self.alpha[-2]*new_values[-2] - \
-                 (1-self.beta[-2])*old_values[-1])
-
-        return max(self.payoffs[-1], payoff)
-    
-    def calculate_payoff(self, k, rhs, old_values, new_values):
-        payoff = old_values[k] + \
-            self.omega/(1-self.beta[k+1]) * \
-                (rhs[k] + \
-                 self.alpha[k+1]*new_values[k-1] - \
-                 (1-self.beta[k+1])*old_values[k] + \
-                 self.gamma[k+1]*old_values[k+1])
-
-        return max(self.payoffs[k], payoff)
+        self.boundary_values = self.K * self.discount_factors()
 
+    def setup_coefficients(self):
+        super(FDCnAm, self).setup_coefficients()
+        # Per-node PSOR factors, independent of time and iteration
+        self.one_minus_beta = 1 - self.beta[1:self.M]
+        self.psor_scale = self.omega/self.one_minus_beta
+        
     def traverse_grid(self):
         """ Solve using linear systems of equations """
-        aux = np.zeros(self.M-1)
-        new_values = np.zeros(self.M-1)
+        rhs = np.empty(self.M-1)
+        old_values = np.empty(self.M-1)
+        new_values = np.empty(self.M-1)
+        alpha, gamma = self.alpha[1:self.M], self.gamma[1:self.M]
+        if HAS_CYTHON and not HAS_NUMBA:
+            psor_sweep = _cy_psor_sweep
+        else:
+            psor_sweep = _psor_sweep
 
         for j in reversed(range(self.N)):
-            aux[0] = self.alpha[1]*(self.boundary_values[j] +
-                                    self.boundary_values[j+1])
-            rhs = np.dot(self.M2, self.past_values) + aux
-            old_values = np.copy(self.past_values)
-            error = sys.float_info.max
-
-            while self.tol < error:
-                new_values[0] = \
-                    self.calculate_payoff_start_boundary(
-                        rhs, old_values)            
-
-                for k in range(self.M-2)[1:]:
-                    new_values[k] = \
-                        self.calculate_payoff(
-                            k, rhs, old_values, new_values)                    
-
-                new_values[-1] = \
-                    self.calculate_payoff_end_boundary(
-                        rhs, old_values, new_values)
-
-                error = np.linalg.norm(new_values-old_values)
-                old_values = np.copy(new_values)
-
-                self.past_values = np.copy(new_values)
+            _tri_matvec(*self.M2, self.past_values, rhs)
+            rhs[0] += self.alpha[1]*(self.boundary_values[j] +
+                                     self.boundary_values[j+1])
+            old_values[:] = self.past_values
+            err2 = sys.float_info.max
+
+            # Compare squared norms, no sqrt needed per iteration
+            while self.tol*self.tol < err2:
+                err2 = psor_sweep(
+                    rhs, old_values, new_values, self.payoffs,
+                    alpha, self.one_minus_beta, gamma,
+                    self.psor_scale)
+                # Latest iterate becomes the input of the next sweep
+                old_values, new_values = new_values, old_values
+
+            self.past_values = old_values.copy()
 
         self.values = np.concatenate(
-            ([self.boundary_values[0]], new_values, [0]))
+            ([self.boundary_values[0]], self.past_values, [0]))
 
     def interpolate(self):
         # Use linear interpolation on final values as 1D array
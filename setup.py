@@ -0,0 +1,17 @@
+"""
+Build-only script for the optional Cython kernels, used when
+numba is not available. It needs Cython and does not install
+the package, run it from the repository root with
+
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+setup(
+    name='option-pricing',
+    ext_modules=cythonize(
+        [Extension('_fd_kernels', ['_fd_kernels.pyx'],
+                   extra_compile_args=['-O3'])],
+        language_level=3),
+)